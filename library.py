@@ -1,18 +1,33 @@
+import bisect
 import csv
 import os
 import random
+import sys
 from datetime import datetime, timedelta
 
 # --- Configuration ---
 FILE_NAME = 'library_data.txt'
 FIELDNAMES = ['BookID', 'Title', 'Author', 'TotalCopies', 'AvailableCopies']
+FILE_ENCODING = 'utf-8'
+ID_MIN, ID_MAX = 1000, 9999 # Range of generated book IDs
+IO_BUFFER_SIZE = 1 << 20 # 1 MiB, cuts read/write syscalls on large catalogs
+LOAN_DAYS = 14
+FINE_PER_DAY = 10 # Rs per overdue day
+BOOK_FORMAT = ("ID: {0:<5} | Title: {1:<30} | Author: {2:<20} | "
+               "Total: {3:<3} | Available: {4:<3}")
 
 class Book:
     """Represents a book in the library's collection."""
+    __slots__ = ('book_id', 'title', 'author', 'total_copies', 'available_copies',
+                 '_id_lc', '_title_lc')
+
     def __init__(self, book_id, title, author, total_copies, available_copies):
         self.book_id = str(book_id)
         self.title = title
         self.author = author
+        # Lowercased copies used for case-insensitive matching
+        self._id_lc = self.book_id.lower()
+        self._title_lc = title.lower()
         # Ensuring numerical types with exception handling
         try:
             self.total_copies = int(total_copies)
@@ -23,18 +38,12 @@ class Book:
 
     def __str__(self):
         """Returns a formatted string of the book's details."""
-        return (f"ID: {self.book_id:<5} | Title: {self.title:<30} | Author: {self.author:<20} | "
-                f"Total: {self.total_copies:<3} | Available: {self.available_copies:<3}")
-
-    def to_dict(self):
-        """Converts the Book object to a dictionary for CSV writing."""
-        return {
-            'BookID': self.book_id,
-            'Title': self.title,
-            'Author': self.author,
-            'TotalCopies': self.total_copies,
-            'AvailableCopies': self.available_copies
-        }
+        return BOOK_FORMAT.format(self.book_id, self.title, self.author,
+                                  self.total_copies, self.available_copies)
+
+    def to_row(self):
+        """Converts the Book object to a tuple in FIELDNAMES order for CSV writing."""
+        return (self.book_id, self.title, self.author, self.total_copies, self.available_copies)
         
     def check_out(self):
         """Decrements available copies upon borrowing."""
@@ -53,7 +62,23 @@ class Book:
 class Library:
     """Manages the entire collection of books and library operations."""
     def __init__(self):
+        # Cleared by _load_books if the file could only be partially read
+        self._load_ok = True
         self.books = self._load_books()
+        # Lookup indexes kept in sync with self.books: {BookID: Book}, {title.lower(): [Book, ...]}
+        self._by_id = {}
+        self._by_title = {}
+        for book in self.books:
+            self._index_book(book)
+        # One byte per 4-digit ID (1000-9999); 1 marks the ID as taken
+        self._used_ids = bytearray(ID_MAX - ID_MIN + 1)
+        for book_id in self._by_id:
+            # isdecimal, not isdigit: characters like '²' pass isdigit but int() rejects them
+            if book_id.isdecimal() and ID_MIN <= int(book_id) <= ID_MAX:
+                self._used_ids[int(book_id) - ID_MIN] = 1
+        # Search buffer built lazily by _build_search_index; None means stale
+        self._search_blob = None
+        self._search_offsets = []
         # This dictionary stores issued books: {BookID: (IssueDate, DueDate)}
         # In a real system, you'd track users too, but this simplifies the core logic.
         self.issued_books = {} 
@@ -65,7 +90,7 @@ class Library:
         books = []
         if not os.path.exists(FILE_NAME):
             try:
-                with open(FILE_NAME, 'w', newline='') as f:
+                with open(FILE_NAME, 'w', newline='', buffering=IO_BUFFER_SIZE, encoding=FILE_ENCODING) as f:
                     writer = csv.DictWriter(f, fieldnames=FIELDNAMES)
                     writer.writeheader()
                 return books
@@ -74,61 +99,118 @@ class Library:
                 return books
 
         try:
-            with open(FILE_NAME, 'r', newline='') as f:
-                reader = csv.DictReader(f, fieldnames=FIELDNAMES)
-                next(reader) # Skip the header row
+            with open(FILE_NAME, 'r', newline='', buffering=IO_BUFFER_SIZE, encoding=FILE_ENCODING) as f:
+                # csv.reader yields plain lists, avoiding a dict allocation per row
+                reader = csv.reader(f)
+                next(reader, None) # Skip the header row
+                num_fields = len(FIELDNAMES)
                 for row in reader:
                     # Exception Handling for corrupted data rows
                     try:
-                        if all(key in row for key in FIELDNAMES):
-                            book = Book(
-                                row['BookID'], row['Title'], row['Author'], 
-                                row['TotalCopies'], row['AvailableCopies']
-                            )
-                            books.append(book)
+                        if len(row) >= num_fields:
+                            books.append(Book(*row[:num_fields]))
+                        elif row:
+                            print(f"Skipping incomplete book record: {row}")
                     except Exception as e:
                         print(f"Skipping corrupted book record: {row} -> Error: {e}")
             return books
         except Exception as e:
+            # e.g. UnicodeDecodeError for a file not written as FILE_ENCODING
             print(f"An error occurred during file loading: {e}")
+            print(f"   Saving is disabled so the partial catalog does not overwrite {FILE_NAME}.")
+            self._load_ok = False
             return books
 
     def save_books(self):
         """Saves the current list of Book objects back to the CSV file."""
+        if not self._load_ok:
+            print(f"\n!!! ERROR: Not saving. {FILE_NAME} failed to load, so the catalog in memory is incomplete. !!!")
+            return
         try:
-            with open(FILE_NAME, 'w', newline='') as f:
-                writer = csv.DictWriter(f, fieldnames=FIELDNAMES)
-                writer.writeheader()
-                for book in self.books:
-                    writer.writerow(book.to_dict())
+            with open(FILE_NAME, 'w', newline='', buffering=IO_BUFFER_SIZE, encoding=FILE_ENCODING) as f:
+                writer = csv.writer(f)
+                writer.writerow(FIELDNAMES)
+                writer.writerows(book.to_row() for book in self.books)
             print(f"\n--- Catalog saved successfully to {FILE_NAME} ---")
         except Exception as e:
             print(f"\n!!! ERROR: Could not save data to file. {e} !!!")
 
     # --- Utility Functions ---
     
+    def _index_book(self, book):
+        """Registers a book in the ID and title lookup indexes."""
+        # Keep the first book for a duplicated ID, matching catalog order
+        self._by_id.setdefault(book.book_id, book)
+        self._by_title.setdefault(book._title_lc, []).append(book)
+
+    def _build_search_index(self):
+        """Joins every lowercased ID and title into one newline-separated buffer.
+
+        Entries alternate ID, title per book, so entry i belongs to self.books[i // 2].
+        """
+        parts = []
+        for book in self.books:
+            parts.append(book._id_lc)
+            parts.append(book._title_lc)
+
+        offsets = []
+        pos = 0
+        for part in parts:
+            offsets.append(pos)
+            pos += len(part) + 1 # +1 for the separator
+        self._search_blob = '\n'.join(parts)
+        self._search_offsets = offsets
+
     def _get_next_id(self):
-        """Generates a random 4-digit ID for a new book."""
-        existing_ids = {book.book_id for book in self.books}
-        while True:
-            new_id = str(random.randint(1000, 9999))
-            if new_id not in existing_ids:
-                return new_id
+        """Returns a random unused 4-digit ID, or None if all IDs are taken."""
+        # Probe forward from a random slot, wrapping around once
+        start = random.randrange(len(self._used_ids))
+        idx = self._used_ids.find(0, start)
+        if idx == -1:
+            idx = self._used_ids.find(0, 0, start)
+            if idx == -1:
+                return None
+        self._used_ids[idx] = 1
+        return str(ID_MIN + idx)
 
     def _find_book(self, query):
-        """Finds a book object by ID or Title (returns the first match)."""
+        """Finds a book object by ID or Title.
+
+        Tries an exact ID, then an exact (case-insensitive) title, then the first book in
+        catalog order whose ID matches case-insensitively or whose title contains the query.
+        """
+        # Fast paths: exact ID, then exact title
+        book = self._by_id.get(query)
+        if book:
+            return book
         query = query.lower()
+        matches = self._by_title.get(query)
+        if matches:
+            return matches[0]
+
+        # Fall back to a scan for case-insensitive IDs and partial titles
         for book in self.books:
-            if query == book.book_id.lower() or query in book.title.lower():
+            if query == book._id_lc or query in book._title_lc:
                 return book
         return None
 
+    @staticmethod
+    def _calculate_fine(due_date, today):
+        """Returns (overdue_days, fine) for a loan due on due_date, as of today."""
+        if today <= due_date:
+            return 0, 0
+        overdue_days = (today - due_date).days
+        return overdue_days, overdue_days * FINE_PER_DAY
+
     # --- Core Features ---
 
     def add_book(self):
         """Allows adding a new book to the catalog."""
         print("\n--- Add New Book ---")
         book_id = self._get_next_id()
+        if book_id is None:
+            print("❌ Cannot add book. All 4-digit book IDs are in use.")
+            return
         title = input("Enter Title: ").strip()
         author = input("Enter Author: ").strip()
         
@@ -146,6 +228,8 @@ class Library:
         # Available copies start equal to total copies
         new_book = Book(book_id, title, author, total_copies, total_copies)
         self.books.append(new_book)
+        self._index_book(new_book)
+        self._search_blob = None
         print(f"\n✅ Book '{title}' added with ID: {book_id}")
 
     def display_all_books(self):
@@ -156,9 +240,8 @@ class Library:
             return
 
         print("-" * 80)
-        # Using the __str__ method of the Book class to display
-        for book in self.books:
-            print(book)
+        # Using the __str__ method of the Book class, emitted as one write instead of one print per book
+        sys.stdout.write('\n'.join(map(str, self.books)) + '\n')
         print("-" * 80)
 
     def search_book(self):
@@ -167,10 +250,22 @@ class Library:
         if not query:
             return
 
-        found_books = [
-            b for b in self.books 
-            if query.lower() in b.book_id.lower() or query.lower() in b.title.lower()
-        ]
+        if self._search_blob is None:
+            self._build_search_index()
+        blob = self._search_blob
+        offsets = self._search_offsets
+
+        # Let str.find scan the whole catalog in C, mapping each hit back to its book
+        q = query.lower()
+        found_books = []
+        pos = blob.find(q)
+        while pos != -1:
+            row = (bisect.bisect_right(offsets, pos) - 1) // 2
+            found_books.append(self.books[row])
+            next_entry = 2 * row + 2 # Skip the rest of this book to avoid duplicates
+            if next_entry >= len(offsets):
+                break
+            pos = blob.find(q, offsets[next_entry])
 
         if found_books:
             print("\n--- Search Results ---")
@@ -189,8 +284,9 @@ class Library:
             return
 
         if book.check_out():
-            due_date = datetime.now() + timedelta(days=14) # Set due date for 14 days
-            self.issued_books[book.book_id] = (datetime.now(), due_date)
+            now = datetime.now()
+            due_date = now + timedelta(days=LOAN_DAYS)
+            self.issued_books[book.book_id] = (now, due_date)
             print(f"✅ Successfully issued '{book.title}'.")
             print(f"   Due Date: {due_date.strftime('%Y-%m-%d')}")
         else:
@@ -221,13 +317,40 @@ class Library:
             # Fine Calculation (Simplified)
             today = datetime.now()
             if today > due_date:
-                overdue_days = (today - due_date).days
-                fine = overdue_days * 10 # Rs 10 per day fine
+                overdue_days, fine = self._calculate_fine(due_date, today)
                 print(f"⚠️ Book is {overdue_days} days overdue. Fine: Rs {fine:.2f}")
             else:
                 print("   Returned on time. No fine.")
         else:
             print(f"❌ Error: Cannot return '{book.title}'. Available copies equals total copies.")
+
+    def list_overdue(self):
+        """Lists all issued books past their due date with the fine owed so far.
+
+        issued_books is not saved to FILE_NAME and starts empty on every run, so only
+        loans made in the current session (running longer than LOAN_DAYS) can appear here.
+        """
+        print("\n--- Overdue Books ---")
+        # One clock read for the whole report
+        today = datetime.now()
+        overdue = []
+        for book_id, (_, due_date) in self.issued_books.items():
+            overdue_days, fine = self._calculate_fine(due_date, today)
+            if overdue_days > 0:
+                overdue.append((book_id, due_date, overdue_days, fine))
+
+        if not overdue:
+            print("No books are currently overdue.")
+            return
+
+        total_fines = 0
+        for book_id, due_date, overdue_days, fine in overdue:
+            book = self._by_id.get(book_id)
+            title = book.title if book else "<unknown>"
+            print(f"ID: {book_id:<5} | Title: {title:<30} | Due: {due_date.strftime('%Y-%m-%d')} | "
+                  f"Overdue: {overdue_days:<3} days | Fine: Rs {fine:.2f}")
+            total_fines += fine
+        print(f"Total outstanding fines: Rs {total_fines:.2f}")
             
 
 # --- Main Application Loop ---
@@ -235,7 +358,16 @@ class Library:
 def main():
     """The main function to run the Library Management System."""
     library = Library()
-    
+    # Menu choice -> action; Exit ('6') is handled separately since it ends the loop
+    actions = {
+        '1': library.add_book,
+        '2': library.display_all_books,
+        '3': library.search_book,
+        '4': library.issue_book,
+        '5': library.return_book,
+        '7': library.list_overdue,
+    }
+
     while True:
         print("\n==============================================")
         print("    LIBRARY MANAGEMENT SYSTEM (using Python)")
@@ -246,26 +378,20 @@ def main():
         print("4. Issue Book")
         print("5. Return Book & Calculate Fine")
         print("6. Exit & Save Catalog")
+        print("7. List Overdue Books & Fines")
         print("----------------------------------------------")
 
-        choice = input("Enter your choice (1-6): ").strip()
-
-        if choice == '1':
-            library.add_book()
-        elif choice == '2':
-            library.display_all_books()
-        elif choice == '3':
-            library.search_book()
-        elif choice == '4':
-            library.issue_book()
-        elif choice == '5':
-            library.return_book()
+        choice = input("Enter your choice (1-7): ").strip()
+
+        action = actions.get(choice)
+        if action:
+            action()
         elif choice == '6':
             library.save_books()
             print("👋 Thank you for using the Library Management System. Goodbye!")
             break
         else:
-            print("\n❌ Invalid choice. Please enter a number between 1 and 6.")
+            print("\n❌ Invalid choice. Please enter a number between 1 and 7.")
 
 # Execute the main function
 if __name__ == "__main__":